@@ -2,31 +2,55 @@
 """
 Generate OpenAPI specification for the Notes API.
 Run this script from the notes_backend directory to update the interfaces/openapi.json file.
+
+The spec is only regenerated when the application sources, .env, the
+APP_* environment variables or the installed FastAPI, Starlette or Pydantic
+versions changed since the last run; pass --force to regenerate regardless.
 """
 
 import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add src to Python path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-def generate_openapi():
+output_dir = Path(__file__).parent / "interfaces"
+output_path = output_dir / "openapi.json"
+signature_path = output_dir / ".sig"
+
+
+def generate_openapi(force=False):
     """Generate and save the OpenAPI specification."""
     try:
+        from api.openapi_cache import source_signature
+        
+        signature = source_signature()
+        if (not force and output_path.exists() and signature_path.exists()
+                and signature_path.read_text() == signature):
+            # Nothing changed: skip importing the app and walking its models
+            print(f"✅ OpenAPI specification is up to date: {output_path}")
+            return
+        
         from api.main import app
         
         # Get the OpenAPI schema
         openapi_schema = app.openapi()
         
         # Write to interfaces directory
-        output_dir = Path(__file__).parent / "interfaces"
         output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "openapi.json"
         
-        with open(output_path, "w") as f:
-            json.dump(openapi_schema, f, indent=2)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(openapi_schema, option=orjson.OPT_INDENT_2))
+        else:
+            output_path.write_text(json.dumps(openapi_schema, indent=2))
+        signature_path.write_text(signature)
         
         print(f"✅ OpenAPI specification generated: {output_path}")
         print(f"📊 Found {len(openapi_schema.get('paths', {}))} endpoints")
@@ -47,4 +71,4 @@ def generate_openapi():
         sys.exit(1)
 
 if __name__ == "__main__":
-    generate_openapi()
+    generate_openapi(force="--force" in sys.argv[1:])
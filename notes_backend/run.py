@@ -25,9 +25,23 @@ if __name__ == "__main__":
     print(f"Server will be available at: http://{settings.host}:{settings.port}")
     print(f"API documentation at: http://{settings.host}:{settings.port}/docs")
     
+    # --reload and multiple workers are mutually exclusive in uvicorn
+    workers = 1 if settings.debug else settings.workers
+    
+    # Notes live in each worker's own memory, so with several workers a
+    # note created on one is missing (or a different note with the same ID)
+    # on the others, and with a data file they overwrite each other's records
+    if workers > 1:
+        print(f"❌ WORKERS={workers} is not supported: notes are stored in "
+              "process memory, so the API must run as a single worker")
+        sys.exit(1)
+    
     uvicorn.run(
         "src.api.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug
+        reload=settings.debug,
+        loop="uvloop",
+        http="httptools",
+        workers=workers
     )
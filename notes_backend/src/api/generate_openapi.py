@@ -8,6 +8,11 @@ import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -24,8 +29,10 @@ def generate_openapi():
     output_dir.mkdir(exist_ok=True)
     output_path = output_dir / "openapi.json"
     
-    with open(output_path, "w") as f:
-        json.dump(openapi_schema, f, indent=2)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(openapi_schema, option=orjson.OPT_INDENT_2))
+    else:
+        output_path.write_text(json.dumps(openapi_schema, indent=2))
     
     print(f"✅ OpenAPI specification generated: {output_path}")
     print(f"📊 Found {len(openapi_schema.get('paths', {}))} endpoints")
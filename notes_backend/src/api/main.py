@@ -1,22 +1,48 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 # Handle both relative and absolute imports
 try:
     from ..config import settings
     from ..routers import notes_router
+    from .openapi_cache import load_schema, save_schema, source_signature
     from ..services.database import db
 except ImportError:
     # Fallback for when running as script
     from config import settings
     from routers import notes_router
+    from api.openapi_cache import load_schema, save_schema, source_signature
     from services.database import db
 
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background data file flush for the lifetime of the app."""
+    flush_task = asyncio.create_task(db.run_flush_loop()) if db.data_file else None
+    yield
+    if flush_task:
+        flush_task.cancel()
+    # Write whatever the loop has not picked up yet
+    db.flush()
+
+
 # Initialize FastAPI app with comprehensive metadata
 app = FastAPI(
     title=settings.app_name,
     description=settings.app_description,
     version=settings.app_version,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
     openapi_tags=[
         {
             "name": "health",
@@ -29,6 +55,44 @@ app = FastAPI(
     ]
 )
 
+class UnhandledErrorMiddleware:
+    """
+    Turn any unhandled error into a JSON 500 response.
+    
+    Registered before CORSMiddleware so it runs inside it and the 500 gets
+    the same CORS headers as any other response; an exception handler for
+    ``Exception`` would run in Starlette's outermost ServerErrorMiddleware,
+    past the CORS layer.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            logger.exception("Unhandled error on %s %s", scope["method"], scope["path"])
+            response = ORJSONResponse({"detail": str(exc)}, status_code=500)
+            await response(scope, receive, send)
+
+
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Configure CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -38,6 +102,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (note lists, the OpenAPI schema) for clients
+# that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Initialize database with data file if configured
 if settings.data_file:
     db.data_file = settings.data_file
@@ -48,9 +116,9 @@ app.include_router(notes_router)
 
 
 # PUBLIC_INTERFACE
-@app.get("/", tags=["health"], summary="Health Check", 
+@app.get("/", tags=["health"], summary="Health Check", operation_id="health_check",
          description="Check if the API is running and healthy")
-def health_check():
+async def health_check():
     """
     Health check endpoint to verify the API is running.
     
@@ -66,9 +134,9 @@ def health_check():
 
 
 # PUBLIC_INTERFACE
-@app.get("/info", tags=["health"], summary="API Information",
+@app.get("/info", tags=["health"], summary="API Information", operation_id="api_info",
          description="Get information about the API")
-def api_info():
+async def api_info():
     """
     Get API information including name, version, and description.
     
@@ -88,6 +156,33 @@ def api_info():
     }
 
 
+# The schema is static once all routes are registered, so build and serialize
+# it a single time and serve the cached bytes instead of re-encoding per hit.
+# With OPENAPI_CACHE_FILE set, it is also reused across restarts for as long
+# as the sources it was generated from are unchanged.
+_openapi_schema = None
+if settings.openapi_cache_file:
+    _openapi_signature = source_signature()
+    _openapi_schema = load_schema(settings.openapi_cache_file, _openapi_signature)
+if _openapi_schema is None:
+    _openapi_schema = app.openapi()
+    if settings.openapi_cache_file:
+        save_schema(settings.openapi_cache_file, _openapi_signature, _openapi_schema)
+app.openapi_schema = _openapi_schema
+_openapi_bytes = orjson.dumps(_openapi_schema)
+app.openapi = lambda: _openapi_schema
+app.router.routes = [
+    route for route in app.router.routes
+    if getattr(route, "path", None) != app.openapi_url
+]
+
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi_json():
+    """Serve the pre-serialized OpenAPI schema."""
+    return Response(content=_openapi_bytes, media_type="application/json")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
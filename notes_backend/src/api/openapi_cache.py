@@ -0,0 +1,70 @@
+"""
+Signature-keyed on-disk cache for the generated OpenAPI schema.
+
+Kept free of FastAPI and application imports so scripts can check whether a
+cached schema is still current without building the app.
+"""
+
+import hashlib
+import os
+from importlib import metadata
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+# The src/ directory whose sources determine the schema
+SRC_PATH = Path(__file__).resolve().parent.parent
+
+# Environment variables that end up in the schema's info block
+SCHEMA_ENV_VARS = ("APP_NAME", "APP_VERSION", "APP_DESCRIPTION")
+
+# Installed packages whose versions shape the generated schema
+SCHEMA_PACKAGES = ("fastapi", "starlette", "pydantic", "pydantic-core")
+
+
+def _package_version(name: str) -> str:
+    """Return the installed version of ``name`` without importing it."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+# PUBLIC_INTERFACE
+def source_signature() -> str:
+    """Hash everything the generated schema depends on."""
+    digest = hashlib.blake2b()
+    sources = sorted(SRC_PATH.rglob("*.py"))
+    env_file = SRC_PATH.parent / ".env"
+    if env_file.exists():
+        sources.append(env_file)
+    for source in sources:
+        digest.update(str(source.relative_to(SRC_PATH.parent)).encode())
+        digest.update(source.read_bytes())
+    for name in SCHEMA_ENV_VARS:
+        digest.update(f"{name}={os.environ.get(name, '')}".encode())
+    for name in SCHEMA_PACKAGES:
+        digest.update(f"{name}=={_package_version(name)}".encode())
+    return digest.hexdigest()
+
+
+# PUBLIC_INTERFACE
+def load_schema(path: str, signature: str) -> Optional[dict]:
+    """Return the schema cached at ``path`` if it was saved for ``signature``."""
+    try:
+        cached = orjson.loads(Path(path).read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(cached, dict) or cached.get("signature") != signature:
+        return None
+    return cached.get("schema")
+
+
+# PUBLIC_INTERFACE
+def save_schema(path: str, signature: str, schema: dict):
+    """Cache ``schema`` at ``path`` under ``signature``."""
+    cache_dir = os.path.dirname(path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    Path(path).write_bytes(orjson.dumps({"signature": signature, "schema": schema}))
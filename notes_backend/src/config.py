@@ -26,9 +26,15 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = False
+    # Notes are stored in process memory, so run.py refuses more than one
+    # worker: each would hand out its own IDs and serve its own notes.
+    workers: int = 1
     
     # Database Settings
-    data_file: Optional[str] = None  # Path to JSON file for data persistence
+    data_file: Optional[str] = None  # Path to JSON Lines log for data persistence
+    
+    # OpenAPI Settings
+    openapi_cache_file: Optional[str] = None  # Path to cache the generated schema across restarts
     
     # CORS Settings
     cors_origins: list[str] = ["*"]
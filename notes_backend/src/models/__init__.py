@@ -1,3 +1,4 @@
 from .note import NoteBase, NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
+from .internal import NoteRecord, LogEntry
 
-__all__ = ["NoteBase", "NoteCreate", "NoteUpdate", "NoteResponse", "NoteListResponse"]
+__all__ = ["NoteBase", "NoteCreate", "NoteUpdate", "NoteResponse", "NoteListResponse", "NoteRecord", "LogEntry"]
@@ -0,0 +1,20 @@
+from typing import Optional
+
+import msgspec
+
+
+class NoteRecord(msgspec.Struct, frozen=True):
+    """Internal storage representation of a note, encoded directly to JSON."""
+    id: int
+    title: str
+    content: str
+    created_at: str
+    updated_at: str
+
+
+class LogEntry(msgspec.Struct, omit_defaults=True):
+    """One line of the data file's append-only log."""
+    op: str  # "put", "del" or "meta"
+    note: Optional[NoteRecord] = None  # op == "put"
+    id: Optional[int] = None  # op == "del"
+    next_id: Optional[int] = None  # op == "meta"
@@ -1,5 +1,7 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Query
+from typing import Any, List
+
+import msgspec
+from fastapi import APIRouter, HTTPException, Query, Response
 
 # Handle both relative and absolute imports
 try:
@@ -16,12 +18,27 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+_encoder = msgspec.json.Encoder()
+
+
+def _json_response(content: Any, status_code: int = 200) -> Response:
+    """
+    Encode NoteRecords (or containers of them) straight to a JSON response.
+    
+    Endpoints return this instead of going through ``response_model`` so the
+    stored records are not re-validated by Pydantic; the documented schema is
+    given with ``responses=`` instead.
+    """
+    return Response(content=_encoder.encode(content), status_code=status_code,
+                    media_type="application/json")
+
 
 # PUBLIC_INTERFACE
-@router.post("/", response_model=NoteResponse, status_code=201, 
+@router.post("/", response_model=None, status_code=201, operation_id="create_note",
+             responses={201: {"model": NoteResponse}},
              summary="Create a new note",
              description="Create a new note with title and content")
-def create_note(note: NoteCreate):
+async def create_note(note: NoteCreate):
     """
     Create a new note.
     
@@ -29,19 +46,17 @@ def create_note(note: NoteCreate):
         note: The note data containing title and content
         
     Returns:
-        NoteResponse: The created note with ID and timestamps
+        Response: The created note with ID and timestamps (NoteResponse shape)
     """
-    try:
-        return db.create_note(note)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create note: {str(e)}")
+    return _json_response(db.create_note(note), status_code=201)
 
 
 # PUBLIC_INTERFACE
-@router.get("/", response_model=NoteListResponse,
+@router.get("/", response_model=None, operation_id="get_notes",
+            responses={200: {"model": NoteListResponse}},
             summary="Get all notes",
             description="Retrieve all notes with pagination support")
-def get_notes(
+async def get_notes(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(10, ge=1, le=100, description="Number of notes per page")
 ):
@@ -53,47 +68,47 @@ def get_notes(
         per_page: Number of notes per page (max 100)
         
     Returns:
-        NoteListResponse: Paginated list of notes
+        Response: Paginated list of notes (NoteListResponse shape)
     """
-    try:
-        skip = (page - 1) * per_page
-        notes, total = db.get_notes(skip=skip, limit=per_page)
-        
-        return NoteListResponse(
-            notes=notes,
-            total=total,
-            page=page,
-            per_page=per_page
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve notes: {str(e)}")
+    skip = (page - 1) * per_page
+    notes, total = db.get_notes(skip=skip, limit=per_page)
+    
+    return _json_response({
+        "notes": notes,
+        "total": total,
+        "page": page,
+        "per_page": per_page
+    })
 
 
 # PUBLIC_INTERFACE
-@router.get("/search", response_model=List[NoteResponse],
+@router.get("/search", response_model=None, operation_id="search_notes",
+            responses={200: {"model": List[NoteResponse]}},
             summary="Search notes",
-            description="Search notes by title or content")
-def search_notes(q: str = Query(..., min_length=1, description="Search query")):
+            description="Search notes by title or content, newest matches first")
+async def search_notes(
+    q: str = Query(..., min_length=1, description="Search query"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of notes to return")
+):
     """
     Search notes by title or content.
     
     Args:
         q: Search query string
+        limit: Maximum number of matching notes to return (max 500)
         
     Returns:
-        List[NoteResponse]: List of matching notes
+        Response: List of matching notes, newest first (NoteResponse shape)
     """
-    try:
-        return db.search_notes(q)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to search notes: {str(e)}")
+    return _json_response(db.search_notes(q, limit=limit))
 
 
 # PUBLIC_INTERFACE
-@router.get("/{note_id}", response_model=NoteResponse,
+@router.get("/{note_id}", response_model=None, operation_id="get_note",
+            responses={200: {"model": NoteResponse}},
             summary="Get a specific note",
             description="Retrieve a specific note by its ID")
-def get_note(note_id: int):
+async def get_note(note_id: int):
     """
     Get a specific note by ID.
     
@@ -101,22 +116,23 @@ def get_note(note_id: int):
         note_id: The ID of the note to retrieve
         
     Returns:
-        NoteResponse: The requested note
+        Response: The requested note (NoteResponse shape)
         
     Raises:
         HTTPException: 404 if note is not found
     """
     note = db.get_note(note_id)
-    if not note:
+    if note is None:
         raise HTTPException(status_code=404, detail="Note not found")
-    return note
+    return _json_response(note)
 
 
 # PUBLIC_INTERFACE
-@router.put("/{note_id}", response_model=NoteResponse,
+@router.put("/{note_id}", response_model=None, operation_id="update_note",
+            responses={200: {"model": NoteResponse}},
             summary="Update a note",
             description="Update an existing note's title and/or content")
-def update_note(note_id: int, note_update: NoteUpdate):
+async def update_note(note_id: int, note_update: NoteUpdate):
     """
     Update an existing note.
     
@@ -125,22 +141,22 @@ def update_note(note_id: int, note_update: NoteUpdate):
         note_update: The updated note data
         
     Returns:
-        NoteResponse: The updated note
+        Response: The updated note (NoteResponse shape)
         
     Raises:
         HTTPException: 404 if note is not found
     """
     updated_note = db.update_note(note_id, note_update)
-    if not updated_note:
+    if updated_note is None:
         raise HTTPException(status_code=404, detail="Note not found")
-    return updated_note
+    return _json_response(updated_note)
 
 
 # PUBLIC_INTERFACE
-@router.delete("/{note_id}", status_code=204,
+@router.delete("/{note_id}", status_code=204, operation_id="delete_note",
                summary="Delete a note",
                description="Delete a note by its ID")
-def delete_note(note_id: int):
+async def delete_note(note_id: int):
     """
     Delete a note by ID.
     
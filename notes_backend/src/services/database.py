@@ -1,118 +1,440 @@
+import asyncio
 import json
+import logging
+import mmap
 import os
+import threading
+import time
+from bisect import bisect_left, insort
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import msgspec
 
 # Handle both relative and absolute imports
 try:
-    from ..models.note import NoteCreate, NoteUpdate, NoteResponse
+    from ..models.internal import LogEntry, NoteRecord
+    from ..models.note import NoteCreate, NoteUpdate
 except ImportError:
-    from models.note import NoteCreate, NoteUpdate, NoteResponse
+    from models.internal import LogEntry, NoteRecord
+    from models.note import NoteCreate, NoteUpdate
+
+
+logger = logging.getLogger(__name__)
+
+# Compact the log once it holds this many records and twice the live notes
+COMPACT_MIN_RECORDS = 1000
+
+_encoder = msgspec.json.Encoder()
+_log_decoder = msgspec.json.Decoder(LogEntry)
+
+
+# (epoch second, local "YYYY-MM-DDTHH:MM:SS" for that second)
+_clock_cache = (None, "")
+
+
+def _now_iso() -> str:
+    """
+    Return the current local time as an ISO 8601 string with microseconds.
+    
+    Matches ``datetime.now().isoformat()`` (except that microseconds are
+    always present) but skips building a datetime object and reuses the
+    formatted date/time part within the same second, so only the
+    microseconds are formatted on most calls.
+    """
+    global _clock_cache
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_seconds, prefix = _clock_cache
+    if seconds != cached_seconds:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seconds))
+        _clock_cache = (seconds, prefix)
+    return f"{prefix}.{micros:06d}"
+
+
+def _trigrams(*texts: str) -> FrozenSet[str]:
+    """Return the set of 3-character substrings occurring in any of ``texts``."""
+    return frozenset(text[i:i + 3] for text in texts for i in range(len(text) - 2))
 
 
 class InMemoryDatabase:
-    """Simple in-memory database with optional JSON file persistence."""
+    """Simple in-memory database with optional append-only JSON Lines persistence."""
     
     def __init__(self, data_file: Optional[str] = None):
         self.data_file = data_file
-        self.notes: Dict[int, dict] = {}
+        # Notes are stored column-wise: index i of every list below belongs
+        # to the same note. Rows are kept in creation order (oldest first);
+        # IDs are handed out monotonically, so _ids stays sorted, lookups by
+        # ID are a bisect and pagination is a contiguous slice.
+        self._ids: List[int] = []
+        self._records: List[NoteRecord] = []
+        # Lowercased title/content, computed at write time so searches only
+        # run substring tests
+        self._titles_lower: List[str] = []
+        self._contents_lower: List[str] = []
+        # Inverted index over the lowercased title and content: trigram ->
+        # sorted IDs of the notes containing it. A note can only match a
+        # query if it contains every one of the query's trigrams, so a search
+        # only substring-tests the notes listed under its rarest trigram.
+        # Each trigram string is stored once and each (trigram, note) pair
+        # costs one list slot.
+        self._postings: Dict[str, List[int]] = {}
         self.next_id = 1
+        # Mutations only queue log records; they are appended to the file by
+        # flush(), normally from run_flush_loop() on the event loop
+        self._pending: List[LogEntry] = []
+        self._log_records = 0
+        # Set when an append fails part way; the file may then end in a
+        # partial line, so the next save rewrites it instead of appending
+        self._append_failed = False
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
         
         # Load data from file if it exists
         if self.data_file and os.path.exists(self.data_file):
             self._load_from_file()
     
     def _load_from_file(self):
-        """Load notes from JSON file."""
+        """Replay the JSON Lines log from the data file."""
+        entries: Optional[List[LogEntry]] = []
+        try:
+            with open(self.data_file, 'rb') as f:
+                # mmap cannot map an empty file
+                if os.fstat(f.fileno()).st_size:
+                    # Decode the whole log straight from the mapped file in a
+                    # single call, without reading it into a bytes object first
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        try:
+                            entries = _log_decoder.decode_lines(mm)
+                        except msgspec.DecodeError:
+                            entries = None
+        except FileNotFoundError:
+            pass
+        
+        if entries is None:
+            # A torn write or a file from before JSON Lines; go line by line
+            self._load_lines_from_file()
+            return
+        self._replay(entries)
+    
+    def _load_lines_from_file(self):
+        """Replay the data file line by line, skipping lines that do not decode."""
+        entries: List[LogEntry] = []
+        tried_legacy = False
+        with open(self.data_file, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(_log_decoder.decode(line))
+                except msgspec.DecodeError:
+                    # Possibly not a log at all but a file from before JSON
+                    # Lines; otherwise a torn write from a crash, which is
+                    # skipped while replay carries on
+                    if not entries and not tried_legacy:
+                        tried_legacy = True
+                        if self._load_legacy_file():
+                            return
+        
+        self._replay(entries)
+        # Rewrite the file so later appends do not land after a partial line
+        self._compact()
+    
+    def _replay(self, entries: List[LogEntry]):
+        """Rebuild the notes from decoded log entries."""
+        notes: Dict[int, NoteRecord] = {}
+        next_id = 1
+        for entry in entries:
+            if entry.op == 'put':
+                notes[entry.note.id] = entry.note
+                next_id = max(next_id, entry.note.id + 1)
+            elif entry.op == 'del':
+                notes.pop(entry.id, None)
+                next_id = max(next_id, entry.id + 1)
+            elif entry.op == 'meta':
+                next_id = max(next_id, entry.next_id)
+        
+        self._set_notes(notes, next_id)
+        self._log_records = len(entries)
+    
+    def _load_legacy_file(self) -> bool:
+        """
+        Load a single-document JSON data file and rewrite it as a log.
+        
+        Returns False, leaving the database untouched, if the file is not in
+        the legacy ``{"notes": ..., "next_id": ...}`` format.
+        """
         try:
             with open(self.data_file, 'r') as f:
                 data = json.load(f)
-                self.notes = {int(k): v for k, v in data.get('notes', {}).items()}
-                self.next_id = data.get('next_id', 1)
-        except (json.JSONDecodeError, FileNotFoundError):
-            self.notes = {}
-            self.next_id = 1
+        except ValueError:
+            # Not JSON (or not even text): a torn log rather than a legacy file
+            return False
+        if not isinstance(data, dict) or 'notes' not in data:
+            return False
+        
+        notes = {}
+        for note in data.get('notes', {}).values():
+            # These files were written with str(datetime); normalize to ISO 8601
+            for field in ('created_at', 'updated_at'):
+                note[field] = datetime.fromisoformat(note[field]).isoformat()
+            notes[note['id']] = NoteRecord(**note)
+        self._set_notes(notes, data.get('next_id', 1))
+        self._compact()
+        return True
+    
+    def _set_notes(self, notes: Dict[int, NoteRecord], next_id: int):
+        """Replace all notes with ``notes`` (keyed by ID) and rebuild the columns."""
+        self._ids = sorted(notes)
+        self._records = [notes[note_id] for note_id in self._ids]
+        self._titles_lower = [record.title.lower() for record in self._records]
+        self._contents_lower = [record.content.lower() for record in self._records]
+        self._postings = {}
+        for note_id, title, content in zip(self._ids, self._titles_lower, self._contents_lower):
+            self._index_note(note_id, _trigrams(title, content))
+        self.next_id = next_id
+        self._pending = []
+    
+    def _index_of(self, note_id: int) -> Optional[int]:
+        """Return the row index of ``note_id``, or None if it does not exist."""
+        i = bisect_left(self._ids, note_id)
+        if i < len(self._ids) and self._ids[i] == note_id:
+            return i
+        return None
+    
+    def _index_note(self, note_id: int, trigrams: FrozenSet[str]):
+        """Add ``note_id`` to the postings of ``trigrams``. Caller holds ``_lock``."""
+        for trigram in trigrams:
+            postings = self._postings.get(trigram)
+            if postings is None:
+                self._postings[trigram] = [note_id]
+            else:
+                insort(postings, note_id)
+    
+    def _unindex_note(self, note_id: int, trigrams: FrozenSet[str]):
+        """Remove ``note_id`` from the postings of ``trigrams``. Caller holds ``_lock``."""
+        for trigram in trigrams:
+            postings = self._postings[trigram]
+            if len(postings) == 1:
+                del self._postings[trigram]
+            else:
+                del postings[bisect_left(postings, note_id)]
+    
+    def _log(self, entry: LogEntry):
+        """Queue a log entry for the next flush. Caller holds ``_lock``."""
+        if self.data_file:
+            self._pending.append(entry)
+    
+    def _snapshot(self) -> Tuple[bytes, int, int]:
+        """
+        Encode the log as one entry per live note.
+        
+        Caller holds ``_file_lock``. Only copying the rows happens under
+        ``_lock`` (records are immutable, so the copy is a consistent view);
+        encoding them does not block mutations. Returns the encoded log, its
+        entry count and the number of pending entries it covers; those may
+        be dropped from ``_pending`` once the snapshot is on disk.
+        """
+        with self._lock:
+            records = self._records[:]
+            next_id = self.next_id
+            written = len(self._pending)
+        entries = [LogEntry('meta', next_id=next_id)]
+        entries.extend(LogEntry('put', note=record) for record in records)
+        return _encoder.encode_lines(entries), len(entries), written
+    
+    def _replace_file(self, payload: bytes):
+        """Atomically replace the data file's contents. Caller holds ``_file_lock``."""
+        tmp_file = f"{self.data_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, self.data_file)
+    
+    def _compact(self):
+        """Rewrite the log as one entry per live note."""
+        with self._file_lock:
+            payload, entries, written = self._snapshot()
+            self._replace_file(payload)
+            with self._lock:
+                del self._pending[:written]
+            self._log_records = entries
+            self._append_failed = False
     
     def _save_to_file(self):
-        """Save notes to JSON file."""
+        """Append pending records to the data file, compacting it when it has grown."""
         if not self.data_file:
             return
+        
+        data_dir = os.path.dirname(self.data_file)
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+        
+        # Serialize whole saves so a shutdown flush cannot interleave with
+        # one still running in the flush loop's worker thread. Only copying
+        # happens under _lock; encoding and the disk write do not block
+        # mutations.
+        with self._file_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                written = len(self._pending)
+                total_records = self._log_records + written
+                compact = (self._append_failed
+                           or total_records > max(2 * len(self._ids), COMPACT_MIN_RECORDS))
+                pending = None if compact else self._pending[:written]
             
-        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-        with open(self.data_file, 'w') as f:
-            json.dump({
-                'notes': self.notes,
-                'next_id': self.next_id
-            }, f, indent=2, default=str)
-    
-    def create_note(self, note_data: NoteCreate) -> NoteResponse:
-        """Create a new note."""
-        now = datetime.now()
-        note_dict = {
-            'id': self.next_id,
-            'title': note_data.title,
-            'content': note_data.content,
-            'created_at': now,
-            'updated_at': now
-        }
+            if compact:
+                payload, total_records, written = self._snapshot()
+                self._replace_file(payload)
+            else:
+                payload = _encoder.encode_lines(pending)
+                try:
+                    with open(self.data_file, 'ab') as f:
+                        f.write(payload)
+                except OSError:
+                    self._append_failed = True
+                    raise
+            
+            # Only drop what reached the disk; on failure the entries stay at
+            # the front of _pending, ahead of anything queued since
+            with self._lock:
+                del self._pending[:written]
+            self._log_records = total_records
+            self._append_failed = False
+    
+    def flush(self):
+        """Write pending changes to the data file, if there are any."""
+        if self._pending:
+            self._save_to_file()
+    
+    async def run_flush_loop(self, interval: float = 0.2):
+        """
+        Periodically flush pending changes off the event loop.
         
-        self.notes[self.next_id] = note_dict
-        self.next_id += 1
+        Coalesces every mutation made within ``interval`` seconds into a
+        single append to the data file. Runs until cancelled; a failed write
+        is logged and retried on the next tick.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if self._pending:
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception:
+                    logger.exception("Failed to flush notes to %s", self.data_file)
+    
+    def create_note(self, note_data: NoteCreate) -> NoteRecord:
+        """Create a new note."""
+        now = _now_iso()
+        with self._lock:
+            record = NoteRecord(
+                id=self.next_id,
+                title=note_data.title,
+                content=note_data.content,
+                created_at=now,
+                updated_at=now
+            )
+            self._ids.append(record.id)
+            self._records.append(record)
+            self._titles_lower.append(record.title.lower())
+            self._contents_lower.append(record.content.lower())
+            self._index_note(record.id, _trigrams(self._titles_lower[-1], self._contents_lower[-1]))
+            self.next_id += 1
+            self._log(LogEntry('put', note=record))
         
-        self._save_to_file()
-        return NoteResponse(**note_dict)
+        return record
     
-    def get_note(self, note_id: int) -> Optional[NoteResponse]:
+    def get_note(self, note_id: int) -> Optional[NoteRecord]:
         """Get a note by ID."""
-        note = self.notes.get(note_id)
-        return NoteResponse(**note) if note else None
+        # Look up and read the row together so a concurrent delete cannot
+        # shift another note into it
+        with self._lock:
+            i = self._index_of(note_id)
+            return self._records[i] if i is not None else None
     
-    def get_notes(self, skip: int = 0, limit: int = 100) -> tuple[List[NoteResponse], int]:
+    def get_notes(self, skip: int = 0, limit: int = 100) -> tuple[List[NoteRecord], int]:
         """Get all notes with pagination."""
-        all_notes = list(self.notes.values())
-        # Sort by created_at descending (newest first)
-        all_notes.sort(key=lambda x: x['created_at'], reverse=True)
-        
-        total = len(all_notes)
-        paginated_notes = all_notes[skip:skip + limit]
-        
-        return [NoteResponse(**note) for note in paginated_notes], total
+        with self._lock:
+            total = len(self._ids)
+            # Walk the rows from the end (newest first)
+            end = max(total - skip, 0)
+            start = max(end - limit, 0)
+            
+            return self._records[start:end][::-1], total
     
-    def update_note(self, note_id: int, note_data: NoteUpdate) -> Optional[NoteResponse]:
+    def update_note(self, note_id: int, note_data: NoteUpdate) -> Optional[NoteRecord]:
         """Update an existing note."""
-        if note_id not in self.notes:
-            return None
-        
-        note = self.notes[note_id]
-        update_data = note_data.model_dump(exclude_unset=True)
-        
-        if update_data:
-            note.update(update_data)
-            note['updated_at'] = datetime.now()
-            self._save_to_file()
+        # Read the two fields directly rather than building a dict with
+        # model_dump(exclude_unset=True); explicit nulls leave a field as is
+        fields_set = note_data.model_fields_set
+        update_title = 'title' in fields_set and note_data.title is not None
+        update_content = 'content' in fields_set and note_data.content is not None
         
-        return NoteResponse(**note)
+        # The row index is only valid while _lock is held: a concurrent
+        # delete shifts every later row down by one
+        with self._lock:
+            i = self._index_of(note_id)
+            if i is None:
+                return None
+            
+            if update_title or update_content:
+                record = self._records[i]
+                old_trigrams = _trigrams(self._titles_lower[i], self._contents_lower[i])
+                title = record.title
+                content = record.content
+                if update_title:
+                    title = note_data.title
+                    self._titles_lower[i] = title.lower()
+                if update_content:
+                    content = note_data.content
+                    self._contents_lower[i] = content.lower()
+                record = msgspec.structs.replace(record, title=title, content=content,
+                                                 updated_at=_now_iso())
+                self._records[i] = record
+                new_trigrams = _trigrams(self._titles_lower[i], self._contents_lower[i])
+                self._unindex_note(note_id, old_trigrams - new_trigrams)
+                self._index_note(note_id, new_trigrams - old_trigrams)
+                self._log(LogEntry('put', note=record))
+            
+            return self._records[i]
     
     def delete_note(self, note_id: int) -> bool:
         """Delete a note by ID."""
-        if note_id in self.notes:
-            del self.notes[note_id]
-            self._save_to_file()
-            return True
-        return False
+        with self._lock:
+            i = self._index_of(note_id)
+            if i is None:
+                return False
+            self._unindex_note(note_id, _trigrams(self._titles_lower[i], self._contents_lower[i]))
+            for column in (self._ids, self._records, self._titles_lower, self._contents_lower):
+                del column[i]
+            self._log(LogEntry('del', id=note_id))
+        return True
     
-    def search_notes(self, query: str) -> List[NoteResponse]:
-        """Search notes by title or content."""
+    def search_notes(self, query: str, limit: int = 50) -> List[NoteRecord]:
+        """Search notes by title or content, returning at most ``limit`` newest matches."""
         query_lower = query.lower()
-        matching_notes = []
+        # Empty for queries shorter than three characters, which then test
+        # every row
+        query_trigrams = _trigrams(query_lower)
         
-        for note in self.notes.values():
-            if (query_lower in note['title'].lower() or 
-                query_lower in note['content'].lower()):
-                matching_notes.append(NoteResponse(**note))
+        # Walk the candidate rows from the end so matches come out newest
+        # first, and stop as soon as there are enough of them. Held under
+        # _lock so the columns cannot shift under the row index mid-scan.
+        matching_notes = []
+        with self._lock:
+            records = self._records
+            titles_lower = self._titles_lower
+            contents_lower = self._contents_lower
+            if query_trigrams:
+                postings = [self._postings.get(trigram, ()) for trigram in query_trigrams]
+                rows = (self._index_of(note_id) for note_id in reversed(min(postings, key=len)))
+            else:
+                rows = range(len(records) - 1, -1, -1)
+            for i in rows:
+                if query_lower in titles_lower[i] or query_lower in contents_lower[i]:
+                    matching_notes.append(records[i])
+                    if len(matching_notes) == limit:
+                        break
         
-        # Sort by created_at descending
-        matching_notes.sort(key=lambda x: x.created_at, reverse=True)
         return matching_notes
 
 
@@ -13,6 +13,7 @@ sys.path.insert(0, str(src_path))
 
 from fastapi.testclient import TestClient
 from src.api.main import app
+from src.services.database import db
 
 def test_notes_api():
     """Test all major API endpoints."""
@@ -65,7 +66,14 @@ def test_notes_api():
     updated_note = response.json()
     assert updated_note["title"] == update_data["title"]
     print(f"✅ Updated note title: {updated_note['title']}")
-    
+
+    # An explicit null title leaves the title as it was
+    response = client.put(f"/notes/{note_id}", json={"title": None})
+    assert response.status_code == 200
+    assert response.json()["title"] == update_data["title"]
+    assert response.json()["content"] == update_data["content"]
+    print("✅ Null title leaves the note unchanged")
+
     # Test getting all notes
     print("\n6. Testing notes list...")
     response = client.get("/notes/")
@@ -82,6 +90,14 @@ def test_notes_api():
     assert len(search_results) >= 1
     print(f"✅ Search found {len(search_results)} matching notes")
     
+    client.post("/notes/", json={"title": "Updated Again", "content": "Another match."})
+    response = client.get("/notes/search?q=Updated&limit=1")
+    assert response.status_code == 200
+    limited_results = response.json()
+    assert len(limited_results) == 1
+    assert limited_results[0]["title"] == "Updated Again"
+    print("✅ Search limit returns only the newest match")
+    
     # Test deleting the note
     print("\n8. Testing note deletion...")
     response = client.delete(f"/notes/{note_id}")
@@ -111,9 +127,30 @@ def test_notes_api():
     print("- GET /notes/search (search notes)")
     print("- DELETE /notes/{id} (delete note)")
 
+
+def test_unhandled_error_response():
+    """Unhandled errors become a JSON 500 that still carries CORS headers."""
+    client = TestClient(app)
+    
+    def fail(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+    
+    original_get_notes = db.get_notes
+    db.get_notes = fail
+    try:
+        response = client.get("/notes/", headers={"Origin": "http://example.com"})
+    finally:
+        db.get_notes = original_get_notes
+    
+    assert response.status_code == 500
+    assert response.json() == {"detail": "database unavailable"}
+    assert response.headers["access-control-allow-origin"] == "*"
+    print("✅ Unhandled errors return a JSON 500 with CORS headers")
+
 if __name__ == "__main__":
     try:
         test_notes_api()
+        test_unhandled_error_response()
     except AssertionError as e:
         print(f"❌ Test failed: {e}")
         sys.exit(1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the database service's JSON Lines persistence.
+Each test writes a data file, reloads an InMemoryDatabase from it and checks what survived.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.models import NoteCreate, NoteUpdate
+from src.services.database import InMemoryDatabase
+
+
+def _titles(db):
+    """Titles of every note in the database, oldest first."""
+    notes, _ = db.get_notes(limit=1000)
+    return [note.title for note in reversed(notes)]
+
+
+def test_put_update_delete_round_trip(tmp_path):
+    """Creates, updates and deletes are replayed from the log on reload."""
+    data_file = str(tmp_path / "notes.jsonl")
+    db = InMemoryDatabase(data_file)
+    first = db.create_note(NoteCreate(title="First", content="one"))
+    second = db.create_note(NoteCreate(title="Second", content="two"))
+    third = db.create_note(NoteCreate(title="Third", content="three"))
+    db.update_note(second.id, NoteUpdate(title="Second, edited"))
+    db.delete_note(third.id)
+    db.flush()
+
+    reloaded = InMemoryDatabase(data_file)
+    assert _titles(reloaded) == ["First", "Second, edited"]
+    assert reloaded.get_note(first.id) == first
+    assert reloaded.get_note(second.id).content == "two"
+    assert reloaded.get_note(third.id) is None
+    # The deleted note's ID is not handed out again
+    assert reloaded.create_note(NoteCreate(title="Fourth", content="four")).id == third.id + 1
+
+
+def test_torn_last_line_is_skipped_and_repaired(tmp_path):
+    """A partial final record from a crash is dropped without losing later writes."""
+    data_file = tmp_path / "notes.jsonl"
+    db = InMemoryDatabase(str(data_file))
+    db.create_note(NoteCreate(title="Kept", content="intact"))
+    db.flush()
+    with open(data_file, "ab") as f:
+        f.write(b'{"op":"put","note":{"id":2,"ti')
+
+    reloaded = InMemoryDatabase(str(data_file))
+    assert _titles(reloaded) == ["Kept"]
+    reloaded.create_note(NoteCreate(title="After crash", content="appended"))
+    reloaded.flush()
+
+    assert _titles(InMemoryDatabase(str(data_file))) == ["Kept", "After crash"]
+
+
+def test_torn_first_line_is_repaired(tmp_path):
+    """A crash during the very first write must not swallow later appends."""
+    data_file = tmp_path / "notes.jsonl"
+    data_file.write_bytes(b'{"op":"put","no')
+
+    db = InMemoryDatabase(str(data_file))
+    assert _titles(db) == []
+    db.create_note(NoteCreate(title="New", content="note"))
+    db.flush()
+
+    assert _titles(InMemoryDatabase(str(data_file))) == ["New"]
+
+
+def test_legacy_single_document_file_is_migrated(tmp_path):
+    """Files from before the JSON Lines format load and are rewritten as a log."""
+    data_file = tmp_path / "notes.json"
+    data_file.write_text(json.dumps({
+        "notes": {
+            "1": {"id": 1, "title": "Old", "content": "from v1",
+                  "created_at": "2024-01-01 10:00:00.500000",
+                  "updated_at": "2024-01-01 10:00:00.500000"},
+        },
+        "next_id": 3
+    }, indent=2))
+
+    db = InMemoryDatabase(str(data_file))
+    assert _titles(db) == ["Old"]
+    assert db.get_note(1).created_at == "2024-01-01T10:00:00.500000"
+    assert json.loads(data_file.read_text().splitlines()[0]) == {"op": "meta", "next_id": 3}
+
+    db.create_note(NoteCreate(title="New", content="after migration"))
+    db.flush()
+    reloaded = InMemoryDatabase(str(data_file))
+    assert _titles(reloaded) == ["Old", "New"]
+    assert reloaded.get_notes()[0][0].id == 3
+
+
+def test_search_matches_plain_substring_scan():
+    """The trigram index never changes which notes a search returns."""
+    db = InMemoryDatabase()
+    samples = [
+        ("Straße", "Die Hauptstraße ist lang"),
+        ("STRASSE", "ss vs ß"),
+        ("İstanbul", "Şehir"),
+        ("ΣΊΣΥΦΟΣ", "Ο μύθος του Σισύφου"),
+        ("Groceries", "milk, eggs, bread"),
+        ("ab", "x"),
+        ("Long note", "needle in a haystack " * 500 + "straße"),
+    ]
+    created = [db.create_note(NoteCreate(title=title, content=content))
+               for title, content in samples]
+    queries = ["", "a", "ab", "x", "ss", "ß", "straße", "STRASSE", "i̇st", "İst",
+               "σίσυφος", "ΣΊΣ", "σ", "eggs", "needle", "haystack needle", "zzz"]
+
+    def check():
+        notes, _ = db.get_notes(limit=1000)
+        for query in queries:
+            q = query.lower()
+            expected = [note for note in notes
+                        if q in note.title.lower() or q in note.content.lower()]
+            assert db.search_notes(query, limit=1000) == expected, query
+
+    check()
+    # Updates and deletes keep the index in step with the notes
+    db.update_note(created[0].id, NoteUpdate(content="no longer about roads"))
+    db.update_note(created[4].id, NoteUpdate(title="Straßenbahn", content="eggs"))
+    db.delete_note(created[6].id)
+    db.delete_note(created[3].id)
+    check()
+    assert db.search_notes("needle") == []
+    assert [note.title for note in db.search_notes("hauptstraße")] == []
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for the signature-keyed OpenAPI schema cache.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.api import openapi_cache
+from src.api.openapi_cache import load_schema, save_schema, source_signature
+
+
+def test_changed_signature_is_a_cache_miss(tmp_path):
+    """A schema cached under one signature is not served for another."""
+    cache_file = str(tmp_path / "openapi_cache.json")
+    schema = {"openapi": "3.1.0", "paths": {}}
+    save_schema(cache_file, "old", schema)
+
+    assert load_schema(cache_file, "old") == schema
+    assert load_schema(cache_file, "new") is None
+
+
+def test_dependency_upgrade_changes_signature(monkeypatch):
+    """Upgrading FastAPI, Starlette or Pydantic invalidates the cached schema."""
+    signature = source_signature()
+    assert source_signature() == signature
+
+    installed_version = openapi_cache._package_version
+    for package in openapi_cache.SCHEMA_PACKAGES:
+        def upgraded_version(name, upgraded=package):
+            return installed_version(name) + (".post1" if name == upgraded else "")
+
+        monkeypatch.setattr(openapi_cache, "_package_version", upgraded_version)
+        assert source_signature() != signature, package
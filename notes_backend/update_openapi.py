@@ -3,65 +3,56 @@
 Simple script to generate and update the OpenAPI specification.
 """
 
-import subprocess
+import json
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-def generate_openapi_spec():
-    """Generate OpenAPI spec by running the FastAPI app and extracting the schema."""
-    
-    # Create a temporary script to extract the OpenAPI schema
-    temp_script = """
-import sys
-import os
-sys.path.insert(0, 'src')
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Add src to Python path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
 
 # Mock environment to avoid config issues
 os.environ.setdefault('APP_NAME', 'Notes API')
 os.environ.setdefault('HOST', '0.0.0.0')
 os.environ.setdefault('PORT', '8000')
 
-from api.main import app
-import json
 
-# Generate the schema
-schema = app.openapi()
+@lru_cache(maxsize=1)
+def _get_app():
+    """Import the FastAPI app once and reuse it for every generation."""
+    from api.main import app
+    return app
 
-# Write to interfaces directory
-import os
-os.makedirs('interfaces', exist_ok=True)
-with open('interfaces/openapi.json', 'w') as f:
-    json.dump(schema, f, indent=2)
 
-print("OpenAPI spec generated successfully!")
-print(f"Endpoints found: {len(schema.get('paths', {}))}")
-for path in schema.get('paths', {}):
-    print(f"  {path}")
-"""
-    
-    # Write temporary script
-    temp_file = Path("temp_openapi_gen.py")
-    temp_file.write_text(temp_script)
-    
+def generate_openapi_spec():
+    """Generate the OpenAPI spec from the in-process app and write it to interfaces/."""
     try:
-        # Run the temporary script
-        result = subprocess.run([sys.executable, str(temp_file)], 
-                              capture_output=True, text=True, cwd=Path.cwd())
-        
-        if result.returncode == 0:
-            print("✅ OpenAPI specification updated successfully!")
-            print(result.stdout)
+        schema = _get_app().openapi()
+
+        output_dir = Path(__file__).parent / "interfaces"
+        output_dir.mkdir(exist_ok=True)
+        output_path = output_dir / "openapi.json"
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
         else:
-            print("❌ Error generating OpenAPI spec:")
-            print(result.stderr)
-            return False
-            
-    finally:
-        # Clean up temporary file
-        if temp_file.exists():
-            temp_file.unlink()
-    
-    return result.returncode == 0
+            output_path.write_text(json.dumps(schema, indent=2))
+    except Exception as e:
+        print("❌ Error generating OpenAPI spec:")
+        print(e)
+        return False
+
+    print("✅ OpenAPI specification updated successfully!")
+    print(f"Endpoints found: {len(schema.get('paths', {}))}")
+    for path in schema.get('paths', {}):
+        print(f"  {path}")
+    return True
 
 if __name__ == "__main__":
     success = generate_openapi_spec()